@@ -0,0 +1,81 @@
+"""
+Shared helpers for the OCPP test scripts in this directory
+"""
+
+import asyncio
+import functools
+import inspect
+import itertools
+import logging
+import logging.handlers
+import sys
+import time
+from datetime import datetime, timezone
+from queue import SimpleQueue
+
+# utc_timestamp() returns the current UTC time as a JSON-encodable value for
+# dumps(): an aware datetime that orjson renders as RFC 3339 ("...Z") in C, or
+# a preformatted ISO-8601 string when falling back to the json module.
+try:
+    import orjson
+
+    _ORJSON_OPTS = orjson.OPT_UTC_Z
+
+    def dumps(obj):
+        return orjson.dumps(obj, option=_ORJSON_OPTS)
+
+    loads = orjson.loads
+
+    utc_timestamp = functools.partial(datetime.now, timezone.utc)
+except ImportError:
+    import json
+
+    def dumps(obj):
+        return json.dumps(obj).encode()
+
+    loads = json.loads
+
+    _TS_FMT = "%04d-%02d-%02dT%02d:%02d:%02d.%03dZ"
+
+    def utc_timestamp():
+        t = time.time()
+        s = int(t)
+        tm = time.gmtime(s)
+        return _TS_FMT % (tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour, tm.tm_min, tm.tm_sec, int((t - s) * 1000))
+
+def text_sender(websocket):
+    """Return a coroutine function that sends encoded JSON bytes as a text frame
+
+    OCPP-J requires text frames. The asyncio websockets client (>= 13) can
+    send bytes with the text opcode directly; the legacy client needs str.
+    """
+    if "text" in inspect.signature(websocket.send).parameters:
+        return functools.partial(websocket.send, text=True)
+    return lambda data: websocket.send(data.decode())
+
+def install_uvloop():
+    """Use uvloop's event loop for asyncio.run when it is installed"""
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+def start_logging(log):
+    """Write log's output from a background thread so the event loop never blocks on stdout"""
+    queue = SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(queue, handler)
+
+    log.addHandler(logging.handlers.QueueHandler(queue))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    listener.start()
+    return listener
+
+def message_ids():
+    """Return an iterator of OCPP message ids, which only need to be unique per connection"""
+    return itertools.count(1)
@@ -3,156 +3,277 @@
 Simulates meter value reporting from a charge point
 """
 
+import abc
 import asyncio
-import json
+import inspect
+import logging
+import math
+import os
 import random
 import sys
-import time
-import uuid
 import websockets
-from datetime import datetime
+
+from _ocpp_common import dumps, install_uvloop, loads, message_ids, start_logging, text_sender, utc_timestamp
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+log = logging.getLogger("simulate_meter_values")
+
+def _make_encoder(action, *fields, raw=(), optional=()):
+    """Generate a function that encodes a fixed-shape Call frame for action
+
+    Each field is either a name, encoded per call, or a (name, value) pair
+    baked into the frame. Names in raw are spliced in as pre-encoded JSON
+    bytes, and names in optional are appended last when not None. The
+    generated function takes the message id and the fields as keywords.
+    """
+    def encode_expr(name):
+        return name if name in raw else f"dumps({name})"
+
+    parts = [repr(b'[2,"'), 'b"%d" % rid']
+    const = b'",' + dumps(action) + b",{"
+    params = []
+    for i, field in enumerate(fields):
+        sep = b"," if i else b""
+        if isinstance(field, tuple):
+            name, value = field
+            const += sep + dumps(name) + b":" + dumps(value)
+        else:
+            params.append(field)
+            parts += [repr(const + sep + dumps(field) + b":"), encode_expr(field)]
+            const = b""
+
+    if optional:
+        # Flush trailing static fields so optional ones follow them
+        parts.append(repr(const))
+        const = b""
+
+    params += [f"{name}=None" for name in optional]
+    signature = f"rid, *, {', '.join(params)}" if params else "rid"
+    lines = [f"def encode({signature}):", f"    parts = [{', '.join(parts)}]"]
+    if optional:
+        # Only separate an optional field from whatever was emitted before it
+        lines.append(f"    sep = {repr(b',' if fields else b'')}")
+    for name in optional:
+        lines.append(f"    if {name} is not None:")
+        lines.append(f"        parts += [sep + {repr(dumps(name) + b':')}, {encode_expr(name)}]")
+        lines.append('        sep = b","')
+    lines.append(f"    parts.append({repr(const + b'}]')})")
+    lines.append('    return b"".join(parts)')
+
+    namespace = {"dumps": dumps}
+    exec("\n".join(lines), namespace)
+    return namespace["encode"]
+
+_ENCODERS = {
+    "BootNotification": _make_encoder(
+        "BootNotification", ("chargePointModel", "Simulator"), ("chargePointVendor", "Test")
+    ),
+    "StartTransaction": _make_encoder(
+        "StartTransaction", ("connectorId", 1), ("idTag", "TEST-TAG"), "meterStart", "timestamp"
+    ),
+    "StopTransaction": _make_encoder("StopTransaction", "transactionId", "meterStop", "timestamp"),
+    "MeterValues": _make_encoder(
+        "MeterValues", ("connectorId", 1), "meterValue", raw=("meterValue",), optional=("transactionId",)
+    ),
+}
+
+class _WsBackend(abc.ABC):
+    """Minimal send/recv/close interface over a WebSocket client library"""
+
+    @classmethod
+    @abc.abstractmethod
+    async def connect(cls, uri):
+        """Open a connection to uri and return a backend wrapping it"""
+
+    @abc.abstractmethod
+    async def send(self, data):
+        """Send encoded JSON bytes as a text frame"""
+
+    @abc.abstractmethod
+    async def recv(self):
+        """Return the next incoming frame"""
+
+    @abc.abstractmethod
+    async def close(self):
+        """Close the connection"""
+
+class _WsBackendWebsockets(_WsBackend):
+    """Backend using the pure-Python websockets library"""
+
+    def __init__(self, websocket):
+        self._ws = websocket
+        self._send = text_sender(websocket)
+        # The asyncio client (websockets >= 13) can return text frames as raw
+        # bytes, skipping UTF-8 decoding; the JSON decoder accepts bytes as is
+        self._recv_kwargs = {"decode": False} if "decode" in inspect.signature(websocket.recv).parameters else {}
+
+    @classmethod
+    async def connect(cls, uri):
+        # OCPP frames are a few hundred bytes of JSON, so permessage-deflate
+        # costs more than it saves; keepalive pings are not needed either
+        return cls(await websockets.connect(
+            uri, subprotocols=["ocpp1.6"], compression=None, max_size=2**16, ping_interval=None,
+            close_timeout=1
+        ))
+
+    async def send(self, data):
+        await self._send(data)
+
+    async def recv(self):
+        return await self._ws.recv(**self._recv_kwargs)
+
+    async def close(self):
+        await self._ws.close()
+
+class _WsBackendCurl(_WsBackend):
+    """Backend using curl_cffi's libcurl-based AsyncWebSocket"""
+
+    def __init__(self, session, websocket, text_flag):
+        self._session = session
+        self._ws = websocket
+        self._text_flag = text_flag
+
+    @classmethod
+    async def connect(cls, uri):
+        from curl_cffi import CurlWsFlag
+        from curl_cffi.requests import AsyncSession
+
+        session = AsyncSession()
+        try:
+            websocket = await session.ws_connect(uri, headers={"Sec-WebSocket-Protocol": "ocpp1.6"})
+        except BaseException:
+            await session.close()
+            raise
+        return cls(session, websocket, CurlWsFlag.TEXT)
+
+    async def send(self, data):
+        await self._ws.send(data, self._text_flag)
+
+    async def recv(self):
+        data, _ = await self._ws.recv()
+        return data
+
+    async def close(self):
+        try:
+            await self._ws.close()
+        finally:
+            await self._session.close()
+
+# Selected with the OCPP_WS_BACKEND environment variable
+_WS_BACKENDS = {
+    "websockets": _WsBackendWebsockets,
+    "curl": _WsBackendCurl,
+}
 
 class MeterValueSimulator:
-    def __init__(self, server_url, client_id):
+    def __init__(self, server_url, client_id, backend="websockets"):
         self.server_url = server_url
         self.client_id = client_id
+        self.backend = _WS_BACKENDS[backend]
         self.websocket = None
         self.transaction_id = None
+        self._ids = message_ids()
+
+        # MeterValues sampledValue entries with everything but the value
+        # pre-serialized, so only the numbers are formatted per sample
+        self._energy_tpl = b'{"value":"%s","measurand":"Energy.Active.Import.Register","unit":"Wh"}'
+        self._power_tpl = b'{"value":"%s","measurand":"Power.Active.Import","unit":"W"}'
+        self._current_tpl = b'{"value":"%s","measurand":"Current.Import","unit":"A"}'
+        self._voltage_tpl = b'{"value":"%s","measurand":"Voltage","unit":"V"}'
+        self._temperature_tpl = b'{"value":"%s","measurand":"Temperature","unit":"Celsius"}'
 
     async def connect(self):
         uri = f"{self.server_url}/{self.client_id}"
-        self.websocket = await websockets.connect(uri, subprotocols=["ocpp1.6"])
-        print(f"✓ Connected to {uri}")
+        self.websocket = await self.backend.connect(uri)
+        log.info(f"✓ Connected to {uri}")
 
-    async def send_boot_notification(self):
-        request_id = str(uuid.uuid4())
-        message = [2, request_id, "BootNotification", {
-            "chargePointModel": "Simulator",
-            "chargePointVendor": "Test"
-        }]
+    async def _call(self, action, **fields):
+        """Send an OCPP Call built by the action's encoder and return the decoded response"""
+        await self.websocket.send(_ENCODERS[action](next(self._ids), **fields))
+        return loads(await self.websocket.recv())
 
-        await self.websocket.send(json.dumps(message))
-        response = await self.websocket.recv()
-        print(f"✓ Boot notification accepted")
+    async def send_boot_notification(self):
+        await self._call("BootNotification")
+        log.info("✓ Boot notification accepted")
 
     async def start_transaction(self):
-        request_id = str(uuid.uuid4())
-        message = [2, request_id, "StartTransaction", {
-            "connectorId": 1,
-            "idTag": "TEST-TAG",
-            "meterStart": 1000,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }]
-
-        await self.websocket.send(json.dumps(message))
-        response = await self.websocket.recv()
-        response_data = json.loads(response)
+        response_data = await self._call("StartTransaction", meterStart=1000, timestamp=utc_timestamp())
 
         if response_data[0] == 3:
             self.transaction_id = response_data[2]["transactionId"]
-            print(f"✓ Transaction started: ID={self.transaction_id}")
+            log.info(f"✓ Transaction started: ID={self.transaction_id}")
             return True
         return False
 
-    async def send_meter_values(self, energy_wh, power_w, current_a=None, voltage_v=None, temperature_c=None):
-        request_id = str(uuid.uuid4())
-
-        sampled_values = [
-            {
-                "value": str(energy_wh),
-                "measurand": "Energy.Active.Import.Register",
-                "unit": "Wh"
-            },
-            {
-                "value": str(power_w),
-                "measurand": "Power.Active.Import",
-                "unit": "W"
-            }
-        ]
+    async def send_meter_values(self, energy_wh, power_w, current_a=None, voltage_v=None, temperature_c=None,
+                                timestamp=None):
+        # OCPP 1.6 sampled values are strings; %-formatting bytes is a C fast path
+        energy = b"%d" % int(energy_wh)
+        power = b"%d" % int(power_w)
+        sampled_values = [self._energy_tpl % energy, self._power_tpl % power]
+        summary = f"  Sent: Energy={energy.decode()}Wh, Power={power.decode()}W"
 
         if current_a:
-            sampled_values.append({
-                "value": str(current_a),
-                "measurand": "Current.Import",
-                "unit": "A"
-            })
+            current = b"%.1f" % current_a
+            sampled_values.append(self._current_tpl % current)
+            summary += f", Current={current.decode()}A"
 
         if voltage_v:
-            sampled_values.append({
-                "value": str(voltage_v),
-                "measurand": "Voltage",
-                "unit": "V"
-            })
+            voltage = b"%.1f" % voltage_v
+            sampled_values.append(self._voltage_tpl % voltage)
+            summary += f", Voltage={voltage.decode()}V"
 
         if temperature_c:
-            sampled_values.append({
-                "value": str(temperature_c),
-                "measurand": "Temperature",
-                "unit": "Celsius"
-            })
-
-        message_data = {
-            "connectorId": 1,
-            "meterValue": [{
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "sampledValue": sampled_values
-            }]
-        }
+            temperature = b"%.1f" % temperature_c
+            sampled_values.append(self._temperature_tpl % temperature)
+            summary += f", Temp={temperature.decode()}°C"
 
-        if self.transaction_id:
-            message_data["transactionId"] = self.transaction_id
+        meter_value = b"".join([
+            b'[{"timestamp":', dumps(timestamp or utc_timestamp()), b',"sampledValue":[', b",".join(sampled_values), b"]}]"
+        ])
 
-        message = [2, request_id, "MeterValues", message_data]
+        await self._call("MeterValues", meterValue=meter_value, transactionId=self.transaction_id)
 
-        await self.websocket.send(json.dumps(message))
-        response = await self.websocket.recv()
-
-        print(f"  Sent: Energy={energy_wh}Wh, Power={power_w}W", end="")
-        if current_a:
-            print(f", Current={current_a}A", end="")
-        if voltage_v:
-            print(f", Voltage={voltage_v}V", end="")
-        if temperature_c:
-            print(f", Temp={temperature_c}°C", end="")
-        print()
+        log.info(summary)
 
     async def stop_transaction(self, meter_stop):
         if not self.transaction_id:
             return
 
-        request_id = str(uuid.uuid4())
-        message = [2, request_id, "StopTransaction", {
-            "transactionId": self.transaction_id,
-            "meterStop": meter_stop,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }]
-
-        await self.websocket.send(json.dumps(message))
-        response = await self.websocket.recv()
-        print(f"✓ Transaction stopped at {meter_stop}Wh")
-
-    async def simulate_charging_session(self, duration_seconds=60, interval_seconds=10):
-        print(f"\n📊 Starting charging session simulation ({duration_seconds}s)")
-        print("=" * 50)
-
-        # Initial values
-        energy_wh = 1000
-        base_power = 7400  # 7.4kW
-        voltage = 230
-
-        # Start transaction
-        await self.start_transaction()
-
-        # Send meter values periodically
-        start_time = time.time()
-        while (time.time() - start_time) < duration_seconds:
+        await self._call(
+            "StopTransaction", transactionId=self.transaction_id, meterStop=meter_stop, timestamp=utc_timestamp()
+        )
+        log.info(f"✓ Transaction stopped at {meter_stop}Wh")
+
+    def _generate_samples(self, count, interval_seconds, energy_wh, base_power, voltage):
+        """Return (energy, power, current, voltage, temperature) readings for a session"""
+        if np is not None:
+            rng = np.random.default_rng()
+            power_w = base_power + rng.uniform(-500, 500, count)
+            energy = energy_wh + np.cumsum(power_w * interval_seconds / 3600)
+            current_a = power_w / voltage
+            temperature_c = 25 + rng.uniform(-5, 10, count)
+            voltage_v = voltage + rng.uniform(-5, 5, count)
+
+            return list(zip(
+                energy.astype(int).tolist(),
+                power_w.astype(int).tolist(),
+                np.round(current_a, 1).tolist(),
+                np.round(voltage_v, 1).tolist(),
+                np.round(temperature_c, 1).tolist(),
+            ))
+
+        samples = []
+        for _ in range(count):
             # Simulate realistic variations
-            power_variation = random.uniform(-500, 500)
-            power_w = base_power + power_variation
+            power_w = base_power + random.uniform(-500, 500)
 
             # Calculate energy increment (power * time_interval / 3600)
-            energy_increment = (power_w * interval_seconds) / 3600
-            energy_wh += energy_increment
+            energy_wh += (power_w * interval_seconds) / 3600
 
             # Calculate current from power and voltage
             current_a = power_w / voltage
@@ -163,46 +284,116 @@ class MeterValueSimulator:
             # Add voltage variation
             voltage_v = voltage + random.uniform(-5, 5)
 
-            await self.send_meter_values(
+            samples.append((
                 int(energy_wh),
                 int(power_w),
                 round(current_a, 1),
                 round(voltage_v, 1),
                 round(temperature_c, 1)
-            )
+            ))
+        return samples
+
+    async def _sample_producer(self, queue, samples, duration_seconds, interval_seconds):
+        """Queue timestamped readings paced against absolute deadlines, then a None sentinel"""
+        loop = asyncio.get_running_loop()
+        start_time = deadline = loop.time()
+        for sample in samples:
+            if loop.time() - start_time >= duration_seconds:
+                break
+
+            # Stamp the reading when it is taken, not when the sender gets to it
+            await queue.put((sample, utc_timestamp()))
+
+            deadline += interval_seconds
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+
+        await queue.put(None)
+
+    async def _sample_sender(self, queue):
+        """Send queued readings and return the last energy register value sent"""
+        energy_wh = None
+        while True:
+            item = await queue.get()
+            if item is None:
+                return energy_wh
+
+            sample, timestamp = item
+            await self.send_meter_values(*sample, timestamp=timestamp)
+            energy_wh = sample[0]
+
+    async def simulate_charging_session(self, duration_seconds=60, interval_seconds=10):
+        log.info(f"\n📊 Starting charging session simulation ({duration_seconds}s)")
+        log.info("=" * 50)
+
+        # Initial values
+        energy_wh = 1000
+        base_power = 7400  # 7.4kW
+        voltage = 230
+
+        # Start transaction
+        await self.start_transaction()
 
-            await asyncio.sleep(interval_seconds)
+        # Pre-generate every reading so the send loop only does I/O
+        samples = self._generate_samples(
+            math.ceil(duration_seconds / interval_seconds), interval_seconds, energy_wh, base_power, voltage
+        )
+
+        # Produce readings at a fixed cadence while a separate task sends them,
+        # so waiting on an ack never delays the next sample
+        queue = asyncio.Queue(maxsize=8)
+        producer = asyncio.create_task(
+            self._sample_producer(queue, samples, duration_seconds, interval_seconds)
+        )
+        sender = asyncio.create_task(self._sample_sender(queue))
+        try:
+            _, last_energy_wh = await asyncio.gather(producer, sender)
+        finally:
+            producer.cancel()
+            sender.cancel()
+
+        if last_energy_wh is not None:
+            energy_wh = last_energy_wh
 
         # Stop transaction
         await self.stop_transaction(int(energy_wh))
 
-        print("=" * 50)
-        print(f"✓ Charging session complete. Total energy: {int(energy_wh - 1000)}Wh")
+        log.info("=" * 50)
+        log.info(f"✓ Charging session complete. Total energy: {int(energy_wh - 1000)}Wh")
 
     async def run_tests(self):
         await self.connect()
         await self.send_boot_notification()
 
-        print("\n📋 Test 1: Send single meter value")
+        log.info("\n📋 Test 1: Send single meter value")
         await self.send_meter_values(5000, 3700, 16, 230, 25)
 
-        print("\n📋 Test 2: Simulate charging session")
+        log.info("\n📋 Test 2: Simulate charging session")
         await self.simulate_charging_session(duration_seconds=30, interval_seconds=5)
 
-        print("\n📋 Test 3: Send high power alert")
+        log.info("\n📋 Test 3: Send high power alert")
         await self.send_meter_values(10000, 55000, 240, 230)  # 55kW - should trigger alert
 
-        print("\n✅ All tests completed!")
+        log.info("\n✅ All tests completed!")
 
     async def disconnect(self):
         if self.websocket:
-            await self.websocket.close()
+            try:
+                await asyncio.wait_for(self.websocket.close(), timeout=2.0)
+            except asyncio.TimeoutError:
+                log.info("⚠ Timed out closing the WebSocket connection")
+            finally:
+                self.websocket = None
 
 async def main():
     server_url = sys.argv[1] if len(sys.argv) > 1 else "ws://localhost:8080"
     client_id = sys.argv[2] if len(sys.argv) > 2 else "TEST-CP-METER"
+    backend = os.environ.get("OCPP_WS_BACKEND", "websockets")
+
+    if backend not in _WS_BACKENDS:
+        log.info(f"✗ Unknown OCPP_WS_BACKEND '{backend}' (choose from: {', '.join(_WS_BACKENDS)})")
+        sys.exit(1)
 
-    simulator = MeterValueSimulator(server_url, client_id)
+    simulator = MeterValueSimulator(server_url, client_id, backend)
 
     try:
         await simulator.run_tests()
@@ -210,4 +401,9 @@ async def main():
         await simulator.disconnect()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    install_uvloop()
+    listener = start_logging(log)
+    try:
+        asyncio.run(main())
+    finally:
+        listener.stop()
\ No newline at end of file